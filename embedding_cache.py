@@ -0,0 +1,130 @@
+import json
+import hashlib
+import logging
+import sqlite3
+from typing import List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that caches vectors in a local SQLite database.
+
+    Each text is keyed by (sha256(text), provider, model), so re-indexing an
+    unchanged corpus hits the cache for every chunk and makes zero embedding
+    API calls. Only the uncached subset of a batch is sent to the wrapped
+    model; fresh vectors are upserted back into the cache.
+    """
+
+    _wrapped: BaseEmbedding = PrivateAttr()
+    _provider: str = PrivateAttr()
+    _model_key: str = PrivateAttr()
+    _conn: sqlite3.Connection = PrivateAttr()
+
+    def __init__(self, wrapped: BaseEmbedding, cache_path: str = "embedding_cache.db", **kwargs):
+        super().__init__(
+            model_name=wrapped.model_name,
+            embed_batch_size=wrapped.embed_batch_size,
+            **kwargs,
+        )
+        self._wrapped = wrapped
+        self._provider = type(wrapped).__name__
+        # Matryoshka models serve different vector widths under the same
+        # model string; fold the requested dimensions into the key so a
+        # dimension change invalidates the cache instead of returning
+        # stale vectors of the old width.
+        dimensions = getattr(wrapped, "dimensions", None)
+        self._model_key = (
+            f"{wrapped.model_name}@{dimensions}" if dimensions else wrapped.model_name
+        )
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash TEXT, provider TEXT, model TEXT, vec TEXT, "
+            "PRIMARY KEY (hash, provider, model))"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, hashes: List[str]) -> dict:
+        """Batch-select cached vectors for the given content hashes."""
+        placeholders = ",".join("?" * len(hashes))
+        rows = self._conn.execute(
+            f"SELECT hash, vec FROM embedding_cache "
+            f"WHERE hash IN ({placeholders}) AND provider = ? AND model = ?",
+            (*hashes, self._provider, self._model_key),
+        ).fetchall()
+        return {h: json.loads(vec) for h, vec in rows}
+
+    def _store(self, hashes: List[str], embeddings: List[List[float]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (hash, provider, model, vec) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (h, self._provider, self._model_key, json.dumps(vec))
+                for h, vec in zip(hashes, embeddings)
+            ],
+        )
+        self._conn.commit()
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts via the wrapped model, halving the batch and retrying
+        when the provider rejects it for being too large or too frequent
+        (RateLimitError / HTTP 413).
+        """
+        try:
+            return self._wrapped._get_text_embeddings(texts)
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            retryable = type(e).__name__ == "RateLimitError" or status in (413, 429)
+            if not retryable or len(texts) <= 1:
+                raise
+            logger.warning(
+                "Embedding batch of %d rejected (%s); retrying in halves.",
+                len(texts), type(e).__name__,
+            )
+            mid = len(texts) // 2
+            return self._embed_uncached(texts[:mid]) + self._embed_uncached(texts[mid:])
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        hashes = [self._hash(text) for text in texts]
+        cached = self._lookup(hashes)
+
+        uncached = [(i, text) for i, (text, h) in enumerate(zip(texts, hashes)) if h not in cached]
+        if uncached:
+            fresh = self._embed_uncached([text for _, text in uncached])
+            self._store([hashes[i] for i, _ in uncached], fresh)
+            for (i, _), vec in zip(uncached, fresh):
+                cached[hashes[i]] = vec
+        else:
+            logger.debug("Embedding cache hit for all %d texts.", len(texts))
+
+        return [cached[h] for h in hashes]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        # Queries are transient; pass them straight through to the provider.
+        return self._wrapped._get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self._wrapped._aget_query_embedding(query)
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embedding(text)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._get_text_embeddings(texts)
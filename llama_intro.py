@@ -1,14 +1,55 @@
+# Only lightweight modules are imported at module scope; llama_index and
+# its transitive dependencies (tiktoken, pydantic, openai, httpx, numpy)
+# are imported lazily inside the functions that need them, so answering a
+# semantically cached query never pays the full import cost.
 import os
+import json
+import asyncio
+import functools
+import hashlib
 import logging
 from dotenv import load_dotenv
-from llama_index.llms.openai import OpenAI
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader
-from llama_index.core.retrievers import VectorIndexRetriever
-from llama_index.core.query_engine import RetrieverQueryEngine
-from llama_index.core.response_synthesizers import get_response_synthesizer
-from llama_index.core.response_synthesizers.type import ResponseMode 
-from llama_index.core.postprocessor import SimilarityPostprocessor
-from llama_index.core import Settings
+
+# File name StorageContext uses when persisting the default vector store
+VECTOR_STORE_FNAME = "default__vector_store.json"
+
+# Matryoshka-truncated text-embedding-3-small vectors: 512 dims keep
+# recall close to the full 1536 while shrinking the similarity matrix 3x
+EMBED_DIM = 512
+
+# ----------------------------
+# Shared HTTP / LLM Clients
+# ----------------------------
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """
+    Build the shared LLM once, bound to one pooled HTTP client: avoids a
+    fresh TLS handshake per request and keeps HTTP/2 multiplexing alive
+    for the async fan-outs. gpt-4o-mini: higher throughput and lower
+    per-token latency than gpt-3.5-turbo at comparable quality.
+    """
+    import httpx
+    from llama_index.llms.openai import OpenAI
+
+    limits = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    try:
+        # http2=True needs the optional h2 package; httpx raises at client
+        # construction when it is missing.
+        http_client = httpx.AsyncClient(http2=True, limits=limits)
+    except ImportError:
+        logger.warning("h2 not installed; using HTTP/1.1 with connection pooling.")
+        http_client = httpx.AsyncClient(limits=limits)
+    return OpenAI(temperature=0.2, model="gpt-4o-mini", async_http_client=http_client)
+
+@functools.lru_cache(maxsize=1)
+def get_query_cache():
+    """
+    Semantic response cache: repeated (or near-identical) queries skip the
+    LLM round-trip entirely. Persists across runs.
+    """
+    from semantic_cache import SemanticQueryCache
+
+    return SemanticQueryCache()
 
 # ----------------------------
 # Logging Configuration
@@ -17,159 +58,401 @@ LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
+# ----------------------------
+# Error Handling Decorator
+# ----------------------------
+def log_and_raise(fn):
+    """
+    Log any exception escaping the wrapped function and re-raise it.
+
+    Replaces the per-function try/except boilerplate: each call executes
+    shorter bytecode, and the plain function bodies compose cleanly with
+    other decorators (lru_cache, njit, async conversions).
+    """
+    if asyncio.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                logger.exception("Error in %s.", fn.__name__)
+                raise
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            logger.exception("Error in %s.", fn.__name__)
+            raise
+
+    return wrapper
+
 # ----------------------------
 # Environment Variable Loader
 # ----------------------------
+@functools.lru_cache(maxsize=1)
+@log_and_raise
 def load_api_key():
     """
     Load OpenAI API Key from environment variables.
+
+    Cached so repeated invocations (batch scoring, warm serverless calls)
+    do not re-read and re-parse .env from disk.
     """
-    try:
-        load_dotenv()
-        api_key = os.getenv("OPEN_API_KEY")
-        if not api_key:
-            logger.error("OPEN_API_KEY not found. Please set the API key in environment variables.")
-            raise ValueError("OPEN_API_KEY is missing.")
-        os.environ["OPEN_API_KEY"] = api_key
-        logger.info("Successfully loaded OpenAI API key from environment.")
-        return api_key
-    except Exception as e:
-        logger.exception("Error loading API key.")
-        raise e
+    load_dotenv()
+    api_key = os.getenv("OPEN_API_KEY")
+    if not api_key:
+        logger.error("OPEN_API_KEY not found. Please set the API key in environment variables.")
+        raise ValueError("OPEN_API_KEY is missing.")
+    logger.info("Successfully loaded OpenAI API key from environment.")
+    return api_key
 
 # ----------------------------
 # LLM Configuration
 # ----------------------------
+# Sentinel so warm invocations (serverless, REPL reloads) never rebuild
+# the process-global Settings singletons
+_SETTINGS_CONFIGURED = False
+
+@log_and_raise
 def configure_llm(api_key):
     """
-    Configure OpenAI LLM settings.
+    Configure OpenAI LLM settings. Idempotent: Settings is process-global,
+    so the shared LLM and embed model are only installed once.
     """
-    try:
-        Settings.llm = OpenAI(temperature=0.2, model="gpt-3.5-turbo")
-        logger.info("LLM successfully configured with OpenAI settings.")
-    except Exception as e:
-        logger.exception("Error configuring LLM.")
-        raise e
+    global _SETTINGS_CONFIGURED
+    if _SETTINGS_CONFIGURED:
+        return
+    from llama_index.core import Settings
+    from llama_index.embeddings.openai import OpenAIEmbedding
+    from embedding_cache import CachedEmbedding
+
+    Settings.llm = get_llm()
+    # Larger batches mean ~10x fewer HTTP round-trips during indexing
+    # (OpenAI accepts up to 2048 inputs per embeddings request).
+    Settings.embed_model = CachedEmbedding(
+        OpenAIEmbedding(
+            model="text-embedding-3-small",
+            dimensions=EMBED_DIM,
+            embed_batch_size=100,
+        )
+    )
+    _SETTINGS_CONFIGURED = True
+    logger.info("LLM successfully configured with OpenAI settings.")
+
+# ----------------------------
+# Vector Store Selection
+# ----------------------------
+def build_vector_store():
+    """
+    Build the vector store backing the index. Prefers a FAISS HNSW index,
+    which retrieves in O(log N) instead of the O(N) exact scan and makes a
+    large difference beyond ~10k chunks; falls back to the in-memory
+    SimSIMD store when faiss is not installed. Override with the
+    VECTOR_STORE env var ("faiss" or "simsimd").
+    """
+    backend = os.getenv("VECTOR_STORE", "faiss")
+    if backend == "faiss":
+        try:
+            import faiss
+            from llama_index.vector_stores.faiss import FaissVectorStore
+
+            # Inner product, not the METRIC_L2 default: OpenAI embeddings
+            # are unit-norm so IP equals cosine, keeping scores on the
+            # "higher is better" scale the cutoff postprocessor expects
+            # (L2 distances would invert the filter).
+            faiss_index = faiss.IndexHNSWFlat(EMBED_DIM, 32, faiss.METRIC_INNER_PRODUCT)
+            faiss_index.hnsw.efConstruction = 200
+            faiss_index.hnsw.efSearch = 64
+            logger.info("Using FAISS HNSW vector store.")
+            return FaissVectorStore(faiss_index=faiss_index)
+        except ImportError:
+            logger.warning("faiss not installed; falling back to SimSIMD vector store.")
+    from simsimd_vector_store import SimSIMDVectorStore
+
+    quantize = os.getenv("QUANTIZE_EMBEDDINGS", "1") == "1"
+    # safetensors persistence (with JSON fallback when the library is
+    # missing) gives a zero-copy, io_uring-capable cold load of the matrix
+    return SimSIMDVectorStore(quantize=quantize, persist_format="safetensors")
+
+def load_vector_store(persist_dir):
+    """
+    Reload the persisted vector store, matching the backend used to build it.
+    """
+    backend = os.getenv("VECTOR_STORE", "faiss")
+    if backend == "faiss":
+        try:
+            from llama_index.vector_stores.faiss import FaissVectorStore
+
+            return FaissVectorStore.from_persist_dir(persist_dir)
+        except ImportError:
+            logger.warning("faiss not installed; falling back to SimSIMD vector store.")
+    from simsimd_vector_store import SimSIMDVectorStore
+
+    return SimSIMDVectorStore.from_persist_path(os.path.join(persist_dir, VECTOR_STORE_FNAME))
+
+# ----------------------------
+# Corpus Manifest
+# ----------------------------
+def compute_corpus_digest(data_dir):
+    """
+    Compute a SHA-256 digest over (path, mtime, size) of every file in the
+    data directory. The digest changes whenever any file is added, removed
+    or modified, so it tells us whether a persisted index is still valid.
+    """
+    hasher = hashlib.sha256()
+    for root, _, files in sorted(os.walk(data_dir)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            hasher.update(f"{path}:{stat.st_mtime}:{stat.st_size}".encode("utf-8"))
+    return hasher.hexdigest()
 
 # ----------------------------
 # Document Loader and Indexing
 # ----------------------------
-def load_documents_and_index(data_dir):
+@log_and_raise
+def load_documents_and_index(data_dir, persist_dir="storage"):
     """
     Load documents from a specified directory and create a VectorStoreIndex.
+
+    The index is persisted to `persist_dir` together with a manifest of the
+    corpus. On subsequent runs, if the corpus is unchanged, the index is
+    loaded from disk and no documents are re-read or re-embedded.
     """
-    try:
-        if not os.path.exists(data_dir):
-            logger.error(f"Data directory '{data_dir}' does not exist.")
-            raise FileNotFoundError(f"Directory '{data_dir}' not found.")
-        
-        logger.info("Loading documents from directory: %s", data_dir)
-        try:
-            documents = SimpleDirectoryReader(data_dir).load_data()
-        except Exception as reader_error:
-            logger.error("Failed to load data using SimpleDirectoryReader.")
-            raise RuntimeError(f"Document loading failed: {reader_error}") from reader_error
-
-        if not documents:
-            logger.warning("No documents found in the specified directory.")
-            raise ValueError("No documents available to load.")
-        
-        logger.info("Successfully loaded %d documents.", len(documents))
-        # Create the VectorStoreIndex
+    from llama_index.core import StorageContext, load_index_from_storage
+
+    if not os.path.exists(data_dir):
+        logger.error(f"Data directory '{data_dir}' does not exist.")
+        raise FileNotFoundError(f"Directory '{data_dir}' not found.")
+
+    digest = compute_corpus_digest(data_dir)
+    manifest_path = os.path.join(persist_dir, "manifest.json")
+
+    # Fast path: reload the persisted index when the corpus is unchanged.
+    if os.path.exists(manifest_path):
         try:
-            index = VectorStoreIndex.from_documents(documents)
-        except Exception as index_error:
-            logger.error("Failed to create VectorStoreIndex.")
-            raise RuntimeError(f"Index creation failed: {index_error}") from index_error
-
-        logger.info("VectorStoreIndex created successfully.")
-        return index, len(documents)
-    except FileNotFoundError as fnf_error:
-        logger.error("FileNotFoundError: %s", fnf_error)
-        raise
-    except ValueError as ve_error:
-        logger.warning("ValueError: %s", ve_error)
-        raise
-    except RuntimeError as rt_error:
-        logger.error("RuntimeError: %s", rt_error)
-        raise
-    except Exception as e:
-        logger.exception("An unexpected error occurred while processing documents or creating the index.")
-        raise
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("digest") == digest:
+                logger.info("Corpus unchanged; loading index from '%s'.", persist_dir)
+                vector_store = load_vector_store(persist_dir)
+                storage_context = StorageContext.from_defaults(
+                    vector_store=vector_store, persist_dir=persist_dir
+                )
+                index = load_index_from_storage(storage_context)
+                logger.info("VectorStoreIndex loaded from storage.")
+                return index, manifest.get("num_documents", 0)
+        except Exception as load_error:
+            logger.warning("Failed to load persisted index (%s); rebuilding.", load_error)
+
+    logger.info("Loading documents from directory: %s", data_dir)
+    from llama_index.core import SimpleDirectoryReader, VectorStoreIndex
+    from uring_reader import preload_corpus
+
+    # Warm the page cache with batched io_uring reads where supported,
+    # so the parser workers below never block on cold disk reads.
+    preload_corpus(data_dir)
+    try:
+        # Parse files in parallel; PDF/DOCX parsing dominates ingest time
+        # on multi-file corpora. Tunable for slow disks vs NVMe.
+        num_workers = int(
+            os.getenv("LOAD_DOCUMENTS_NUM_THREADS", max(1, (os.cpu_count() or 2) - 1))
+        )
+        documents = SimpleDirectoryReader(data_dir).load_data(num_workers=num_workers)
+    except Exception as reader_error:
+        logger.error("Failed to load data using SimpleDirectoryReader.")
+        raise RuntimeError(f"Document loading failed: {reader_error}") from reader_error
+
+    if not documents:
+        logger.warning("No documents found in the specified directory.")
+        raise ValueError("No documents available to load.")
+
+    logger.info("Successfully loaded %d documents.", len(documents))
+    # Create the VectorStoreIndex on top of the ANN/SIMD-backed store
+    try:
+        storage_context = StorageContext.from_defaults(vector_store=build_vector_store())
+        index = VectorStoreIndex.from_documents(documents, storage_context=storage_context)
+    except Exception as index_error:
+        logger.error("Failed to create VectorStoreIndex.")
+        raise RuntimeError(f"Index creation failed: {index_error}") from index_error
+
+    # Persist the index and the corpus manifest for the next run.
+    index.storage_context.persist(persist_dir=persist_dir)
+    with open(manifest_path, "w") as f:
+        json.dump({"digest": digest, "num_documents": len(documents)}, f)
+    logger.info("Index persisted to '%s'.", persist_dir)
+
+    logger.info("VectorStoreIndex created successfully.")
+    return index, len(documents)
 
 # ----------------------------
 # Query Engine Setup
 # ----------------------------
+@log_and_raise
 def setup_query_engine(index):
     """
     Configure and return the retriever query engine.
+
+    When the BM25 integration is installed, retrieval runs as a
+    QueryFusionRetriever over BM25 and the vector retriever with
+    use_async=True, so both sub-retrievals execute concurrently and the
+    retrieval stage costs only its critical path.
     """
+    from llama_index.core.query_engine import RetrieverQueryEngine
+    from llama_index.core.response_synthesizers import get_response_synthesizer
+    from llama_index.core.response_synthesizers.type import ResponseMode
+    from llama_index.core.retrievers import VectorIndexRetriever
+    from postprocessors import VectorizedSimilarityPostprocessor
+
+    retriever = VectorIndexRetriever(index=index, similarity_top_k=5)
+    using_fusion = False
     try:
-        retriever = VectorIndexRetriever(index=index, similarity_top_k=5)
-        postprocessor = SimilarityPostprocessor(similarity_cutoff=0.8)
-        synthesizer = get_response_synthesizer(response_mode=ResponseMode.COMPACT)
-        
-        query_engine = RetrieverQueryEngine(
-            retriever=retriever,
-            response_synthesizer=synthesizer,
-            node_postprocessors=[postprocessor]
+        from llama_index.core.retrievers import QueryFusionRetriever
+        from llama_index.core.retrievers.fusion_retriever import FUSION_MODES
+        from llama_index.retrievers.bm25 import BM25Retriever
+
+        bm25_retriever = BM25Retriever.from_defaults(
+            docstore=index.docstore, similarity_top_k=5
         )
-        logger.info("RetrieverQueryEngine successfully configured.")
-        return query_engine
-    except Exception as e:
-        logger.exception("Error setting up query engine.")
-        raise e
+        # RELATIVE_SCORE min-max normalizes each retriever's scores before
+        # merging; raw BM25 scores are unbounded and would otherwise drown
+        # out cosine similarities (<= 1) in the fused ranking.
+        retriever = QueryFusionRetriever(
+            [retriever, bm25_retriever],
+            similarity_top_k=5,
+            num_queries=1,
+            mode=FUSION_MODES.RELATIVE_SCORE,
+            use_async=True,
+        )
+        using_fusion = True
+        logger.info("Using fused BM25 + vector retrieval.")
+    except ImportError:
+        logger.warning("BM25 retriever not installed; using vector retrieval only.")
+    # Fused scores are min-max normalized per retriever, so the absolute
+    # cosine cutoff of 0.8 no longer means anything there; keep it only on
+    # the plain vector path.
+    node_postprocessors = (
+        [] if using_fusion else [VectorizedSimilarityPostprocessor(similarity_cutoff=0.8)]
+    )
+    # TREE_SUMMARIZE keeps each LLM call within the context window for
+    # large top-k and, with use_async=True, runs the leaf
+    # summarizations as parallel LLM calls (ceil(log N) sequential
+    # waves instead of one oversized or N sequential calls). Streaming
+    # keeps user-visible latency at time-to-first-token.
+    synthesizer = get_response_synthesizer(
+        response_mode=ResponseMode.TREE_SUMMARIZE,
+        use_async=True,
+        streaming=True,
+    )
+
+    query_engine = RetrieverQueryEngine(
+        retriever=retriever,
+        response_synthesizer=synthesizer,
+        node_postprocessors=node_postprocessors
+    )
+    logger.info("RetrieverQueryEngine successfully configured.")
+    return query_engine
 
 # ----------------------------
 # Query Execution
 # ----------------------------
-def execute_query(query_engine, query_text):
+@log_and_raise
+async def aexecute_query(query_engine, query_text):
     """
-    Execute a query and return the result.
+    Execute a query asynchronously and return the result.
+
+    Checks the semantic cache first: one embedding call decides whether a
+    semantically equivalent query was answered before, and on a hit the
+    retrieve + synthesize pipeline (and its LLM calls) is skipped.
     """
-    try:
-        logger.info("Executing query: %s", query_text)
-        response = query_engine.query(query_text)
-        logger.info("Query executed successfully.")
-        return response
-    except Exception as e:
-        logger.exception("Error executing query.")
-        raise e
+    from llama_index.core import Settings
+    from llama_index.core.schema import QueryBundle
+
+    logger.info("Executing query: %s", query_text)
+    query_embedding = await Settings.embed_model.aget_query_embedding(query_text)
+    cached = get_query_cache().lookup(query_embedding)
+    if cached is not None:
+        print(cached)
+        return cached
+    # Reuse the embedding from the cache lookup so a miss does not pay a
+    # second embedding round-trip inside the query engine.
+    response = await query_engine.aquery(QueryBundle(query_text, embedding=query_embedding))
+    # Drain the token stream as it arrives, accumulating the full text
+    # ourselves: draining leaves the generator exhausted, so str(response)
+    # afterwards would not reliably reproduce the answer.
+    tokens = []
+    if hasattr(response, "async_response_gen"):
+        async for token in response.async_response_gen():
+            tokens.append(token)
+            print(token, end="", flush=True)
+        print()
+    elif hasattr(response, "response_gen"):
+        for token in response.response_gen:
+            tokens.append(token)
+            print(token, end="", flush=True)
+        print()
+    response_text = "".join(tokens) if tokens else str(response)
+    get_query_cache().store(query_embedding, response_text)
+    logger.info("Query executed successfully.")
+    return response
+
+async def aexecute_queries(query_engine, query_texts, rate_limit=8):
+    """
+    Execute a batch of queries concurrently. The thread no longer idles
+    during each network round-trip: total latency approaches the slowest
+    single query instead of the sum. A semaphore caps in-flight requests
+    to stay within per-minute API quotas.
+    """
+    semaphore = asyncio.Semaphore(rate_limit)
+
+    async def _query(query_text):
+        async with semaphore:
+            return await aexecute_query(query_engine, query_text)
+
+    return await asyncio.gather(*[_query(q) for q in query_texts])
 
 # ----------------------------
 # Main Function
 # ----------------------------
-def main():
+async def main_async():
     """
     Main entry point for loading documents, creating index, and querying the system.
     """
     try:
         logger.info("Starting the application.")
-        
+
         # Load API key and configure LLM
         api_key = load_api_key()
         configure_llm(api_key)
-        
+
         # Load documents and create index
         data_directory = "data"
         index, doc_count = load_documents_and_index(data_directory)
         logger.info("Number of documents loaded: %d", doc_count)
-        
+
         # Set up query engine
         query_engine = setup_query_engine(index)
-        
+
         # Execute a sample query
         sample_query = "What is the content of the documents?"
-        response = execute_query(query_engine, sample_query)
-        
+        response = await aexecute_query(query_engine, sample_query)
+
+        # The response was already streamed to stdout token by token
         logger.info("Response: %s", response)
-        print(f"Query Response:\n{response}")
-    
+
     except Exception as e:
         logger.critical("Application failed to execute due to an error: %s", str(e))
     finally:
         logger.info("Application execution completed.")
 
+def main():
+    asyncio.run(main_async())
+
 # ----------------------------
 # Entry Point
 # ----------------------------
@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+import numpy as np
+
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+
+class VectorizedSimilarityPostprocessor(BaseNodePostprocessor):
+    """
+    Drop-in replacement for SimilarityPostprocessor that applies the
+    similarity cutoff as one vectorized NumPy mask instead of a Python
+    per-node loop — negligible at top-k 5, but it keeps the post-filter
+    off the profile when top-k is raised to ~100 for reranking.
+    """
+
+    similarity_cutoff: float = 0.0
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "VectorizedSimilarityPostprocessor"
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+    ) -> List[NodeWithScore]:
+        if not nodes:
+            return nodes
+        scores = np.fromiter(
+            (n.score if n.score is not None else -np.inf for n in nodes),
+            dtype=np.float32,
+            count=len(nodes),
+        )
+        keep = np.nonzero(scores >= self.similarity_cutoff)[0]
+        return [nodes[i] for i in keep]
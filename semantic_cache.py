@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """
+    Disk-persisted semantic cache of query -> LLM response.
+
+    Lookups embed the incoming query and return the cached response of the
+    nearest past query when cosine similarity exceeds the threshold, which
+    short-circuits the whole retrieve + synthesize pipeline to a single
+    (much cheaper) embedding call. Entries carry a TTL and the cache is
+    bounded with least-recently-used eviction.
+    """
+
+    def __init__(
+        self,
+        path: str = "semantic_cache.json",
+        similarity_threshold: float = 0.95,
+        max_size: int = 256,
+        ttl: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: List[dict] = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._entries = json.load(f)
+            except Exception as e:
+                logger.warning("Could not load semantic cache (%s); starting empty.", e)
+
+    def _evict(self) -> None:
+        now = time.time()
+        self._entries = [e for e in self._entries if now - e["created"] < self.ttl]
+        if len(self._entries) > self.max_size:
+            self._entries.sort(key=lambda e: e["last_used"])
+            self._entries = self._entries[-self.max_size:]
+
+    def _flush(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump(self._entries, f)
+
+    def lookup(self, query_embedding: List[float]) -> Optional[str]:
+        self._evict()
+        if not self._entries:
+            return None
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        matrix = np.asarray([e["vec"] for e in self._entries], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vec)
+        norms[norms == 0] = 1e-12
+        scores = (matrix @ query_vec) / norms
+        best = int(np.argmax(scores))
+        if scores[best] >= self.similarity_threshold:
+            self._entries[best]["last_used"] = time.time()
+            logger.info("Semantic cache hit (similarity %.3f).", scores[best])
+            return self._entries[best]["response"]
+        return None
+
+    def store(self, query_embedding: List[float], response: str) -> None:
+        now = time.time()
+        self._entries.append(
+            {
+                "vec": list(query_embedding),
+                "response": response,
+                "created": now,
+                "last_used": now,
+            }
+        )
+        self._evict()
+        self._flush()
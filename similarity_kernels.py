@@ -0,0 +1,52 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def cosine_batch(query, matrix):
+        """
+        Cosine similarity of `query` against every row of `matrix`,
+        parallelized across rows. cache=True persists the compiled kernel
+        on disk so the JIT warmup is paid once per machine, not per run.
+        """
+        out = np.empty(matrix.shape[0], dtype=np.float32)
+        q_norm = 0.0
+        for j in range(query.size):
+            q_norm += query[j] * query[j]
+        q_norm = np.sqrt(q_norm)
+        for i in prange(matrix.shape[0]):
+            dot = 0.0
+            row_norm = 0.0
+            for j in range(query.size):
+                dot += query[j] * matrix[i, j]
+                row_norm += matrix[i, j] * matrix[i, j]
+            denom = np.sqrt(row_norm) * q_norm
+            out[i] = dot / denom if denom > 0 else 0.0
+        return out
+
+    # Trigger compilation (or load from the on-disk cache) at import so the
+    # first real query does not absorb the JIT pause.
+    cosine_batch(
+        np.zeros(4, dtype=np.float32), np.zeros((1, 4), dtype=np.float32)
+    )
+    logger.debug("Numba cosine_batch kernel ready.")
+
+else:
+
+    def cosine_batch(query, matrix):
+        """NumPy fallback when numba is not installed."""
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms = np.where(norms == 0, 1e-12, norms)
+        return ((matrix @ query) / norms).astype(np.float32)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -13,7 +14,15 @@ if not open_api_key:
     raise ValueError("API key not found. Please set the OPEN_API_KEY environment variable.")
 
 
-response = OpenAI(model = "gpt-3.5-turbo", 
-                    openai_api_key = open_api_key).complete("who is bhagath singh")
+# One client for every call: reuses the pooled TLS connection to the API
+llm = OpenAI(model = "gpt-3.5-turbo", openai_api_key = open_api_key)
 
-print(response)
+async def main():
+    # Stream the completion so tokens print as they arrive instead of
+    # waiting for the full response
+    stream = await llm.astream_complete("who is bhagath singh")
+    async for chunk in stream:
+        print(chunk.delta, end="", flush=True)
+    print()
+
+asyncio.run(main())
@@ -1,22 +1,29 @@
 # pipenv install llama-index llms-gemini google-generativeai llama-index-embeddings-gemini
 
+import asyncio
+import hashlib
+import json
 import logging
 from llama_index.core import Settings
 from llama_index.core import VectorStoreIndex, SimpleDirectoryReader
+from llama_index.core import StorageContext, load_index_from_storage
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.query_engine import RetrieverQueryEngine
+import functools
 import os
 from dotenv import load_dotenv
-load_dotenv()
 
 from llama_index.llms.gemini import Gemini
+from llama_index.embeddings.gemini import GeminiEmbedding
+from embedding_cache import CachedEmbedding
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-# Function to load environment variables safely
+# Function to load environment variables safely (cached: .env is parsed once)
+@functools.lru_cache(maxsize=1)
 def load_env_vars():
     try:
         load_dotenv()
@@ -30,22 +37,57 @@ def load_env_vars():
         logger.exception("Error loading environment variables.")
         raise e
 
-# Set your LLM to Google Gemini Model
+# Set your LLM to Google Gemini Model (cached: Settings is process-global,
+# so warm calls reuse the same client instead of re-instantiating it)
+@functools.lru_cache(maxsize=1)
 def create_llm():
     try:
         google_api_key = load_env_vars()  # Make sure the environment variable is set
         llm = Gemini(model="models/gemini-pro")
+        # Gemini caps embedding batches at 100 inputs per request
+        Settings.embed_model = CachedEmbedding(GeminiEmbedding(embed_batch_size=100))
         logger.info("Google Gemini model created successfully.")
         return llm
     except Exception as e:
         logger.exception("Error creating Google Gemini model.")
         raise e
 
-# Load documents and create the index
-def create_index():
+# Compute a digest of the corpus so we know when the persisted index is stale
+def compute_corpus_digest(data_dir):
+    hasher = hashlib.sha256()
+    for root, _, files in sorted(os.walk(data_dir)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            hasher.update(f"{path}:{stat.st_mtime}:{stat.st_size}".encode("utf-8"))
+    return hasher.hexdigest()
+
+# Load documents and create the index (reusing the persisted one when possible)
+def create_index(data_dir="data", persist_dir="storage_gemini"):
     try:
-        documents = SimpleDirectoryReader("data").load_data()
+        digest = compute_corpus_digest(data_dir)
+        manifest_path = os.path.join(persist_dir, "manifest.json")
+
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+                if manifest.get("digest") == digest:
+                    storage_context = StorageContext.from_defaults(persist_dir=persist_dir)
+                    index = load_index_from_storage(storage_context)
+                    logger.info("Index loaded from persisted storage.")
+                    return index
+            except Exception as load_error:
+                logger.warning("Could not load persisted index (%s); rebuilding.", load_error)
+
+        num_workers = int(
+            os.getenv("LOAD_DOCUMENTS_NUM_THREADS", max(1, (os.cpu_count() or 2) - 1))
+        )
+        documents = SimpleDirectoryReader(data_dir).load_data(num_workers=num_workers)
         index = VectorStoreIndex.from_documents(documents)
+        index.storage_context.persist(persist_dir=persist_dir)
+        with open(manifest_path, "w") as f:
+            json.dump({"digest": digest}, f)
         logger.info("Index created successfully.")
         return index
     except Exception as e:
@@ -53,7 +95,7 @@ def create_index():
         raise e
 
 # Main function to set up retriever and query engine
-def main():
+async def main_async():
     try:
         # Set up the LLM and index
         llm = create_llm()
@@ -67,7 +109,7 @@ def main():
 
         # Example: querying (you can replace this with your actual query logic)
         query = "Sample query text"
-        results = query_engine.query(query)
+        results = await query_engine.aquery(query)
         logger.info(f"Query results: {results}")
 
     except Exception as e:
@@ -75,4 +117,4 @@ def main():
         raise e
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main_async())
\ No newline at end of file
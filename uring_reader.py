@@ -0,0 +1,93 @@
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# How many read submissions to keep in flight on the ring at once
+QUEUE_DEPTH = 64
+# Read files in chunks of this size (matches a typical NVMe stripe)
+CHUNK_SIZE = 1 << 20
+
+
+def preload_corpus(data_dir):
+    """
+    Pull every file under `data_dir` into the page cache using a single
+    io_uring ring with batched read submissions.
+
+    On a cold cache, SimpleDirectoryReader otherwise issues one blocking
+    open()+read() pair per file and never fills the NVMe queue. Submitting
+    all reads through one ring keeps the device saturated; the subsequent
+    parse pass then hits warm pages. Returns True when the preload ran,
+    False when unsupported (non-Linux or liburing missing) so callers can
+    silently fall back to the plain reader path.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import liburing
+    except ImportError:
+        return False
+
+    paths = []
+    for root, _, files in os.walk(data_dir):
+        paths.extend(os.path.join(root, name) for name in files)
+    if not paths:
+        return False
+
+    try:
+        ring = liburing.io_uring()
+        liburing.io_uring_queue_init(QUEUE_DEPTH, ring, 0)
+        pending = 0
+        # Every in-flight buffer must stay referenced until its CQE is
+        # reaped: the liburing wrapper does not keep buffers alive, and a
+        # dropped reference would let the kernel complete a read into freed
+        # interpreter memory.
+        buffers = []
+        # fds whose reads are all submitted; closed only after a reap so
+        # reads stay batched across files instead of draining per file.
+        done_fds = []
+        try:
+            for path in paths:
+                fd = os.open(path, os.O_RDONLY)
+                size = os.fstat(fd).st_size
+                offset = 0
+                while offset < size:
+                    length = min(CHUNK_SIZE, size - offset)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    if sqe is None:
+                        # Ring full: flush and reap before submitting more.
+                        liburing.io_uring_submit(ring)
+                        pending -= _reap(liburing, ring, pending)
+                        buffers.clear()
+                        for done_fd in done_fds:
+                            os.close(done_fd)
+                        done_fds.clear()
+                        sqe = liburing.io_uring_get_sqe(ring)
+                    buf = bytearray(length)
+                    buffers.append(buf)
+                    liburing.io_uring_prep_read(sqe, fd, buf, length, offset)
+                    pending += 1
+                    offset += length
+                done_fds.append(fd)
+            liburing.io_uring_submit(ring)
+            pending -= _reap(liburing, ring, pending)
+            buffers.clear()
+        finally:
+            for done_fd in done_fds:
+                os.close(done_fd)
+            liburing.io_uring_queue_exit(ring)
+        logger.info("Preloaded %d files from '%s' via io_uring.", len(paths), data_dir)
+        return True
+    except Exception as e:
+        logger.warning("io_uring preload failed (%s); falling back to plain reads.", e)
+        return False
+
+
+def _reap(liburing, ring, pending):
+    """Wait for all pending completions on the ring; returns how many."""
+    cqe = liburing.io_uring_cqe()
+    for _ in range(pending):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        liburing.io_uring_cqe_seen(ring, cqe)
+    return pending